@@ -1,7 +1,9 @@
 from flask import Flask, request, jsonify
 import threading
+import uuid
 from secret import EMAIL, SECRET
 from quiz_solver import QuizSolver
+from utils.event_log import register_job, get_job_events, log_event
 
 app = Flask(__name__)
 
@@ -29,7 +31,9 @@ def handle_quiz():
             return jsonify({"error": "Missing URL"}), 400
         
         # Start quiz solver in background thread (non-blocking)
-        solver = QuizSolver()
+        job_id = uuid.uuid4().hex
+        register_job(job_id)  # Create the job's ring buffer before it can be queried
+        solver = QuizSolver(job_id=job_id)
         thread = threading.Thread(
             target=solver.solve_quiz_chain,
             args=(quiz_url,),
@@ -40,13 +44,22 @@ def handle_quiz():
         # Return immediate 200 response
         return jsonify({
             "status": "accepted",
-            "message": "Quiz solving initiated"
+            "message": "Quiz solving initiated",
+            "job_id": job_id
         }), 200
         
     except Exception as e:
-        print(f"Error in handle_quiz: {e}")
+        log_event(f"Error in handle_quiz: {e}", stage='http', level='error')
         return jsonify({"error": "Internal server error"}), 500
 
+@app.route('/jobs/<job_id>/log', methods=['GET'])
+def job_log(job_id):
+    """Return the most recent events logged by a quiz job"""
+    events = get_job_events(job_id)
+    if events is None:
+        return jsonify({"error": "Unknown job"}), 404
+    return jsonify({"job_id": job_id, "events": events}), 200
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
@@ -5,12 +5,13 @@ from secret import EMAIL, SECRET, AIPIPE_TOKEN
 from utils.browser import fetch_quiz_content
 from utils.llm_helper import call_llm
 from utils.data_processor import process_data_task
+from utils.event_log import bind_job, set_step, log_event
 import json
-import traceback
 from urllib.parse import urljoin, urlparse
 
 class QuizSolver:
-    def __init__(self):
+    def __init__(self, job_id=None):
+        self.job_id = job_id
         self.email = EMAIL
         self.secret = SECRET
         self.start_time = None
@@ -21,80 +22,80 @@ class QuizSolver:
         self.start_time = datetime.now()
         current_url = initial_url
         attempt = 0
+        bind_job(self.job_id)
         
-        print(f"\n{'='*60}")
-        print(f"Starting quiz chain at {self.start_time}")
-        print(f"Initial URL: {current_url}")
-        print(f"{'='*60}\n")
+        log_event("Starting quiz chain", stage='chain', url=current_url,
+                  start_time=self.start_time.isoformat())
         
         while current_url and self.within_time_limit():
             attempt += 1
-            print(f"\n--- Attempt {attempt} ---")
-            print(f"Time elapsed: {self.time_elapsed():.1f}s / {self.timeout}s")
-            print(f"Solving: {current_url}")
+            set_step(attempt)
+            log_event("Solving", stage='chain', url=current_url,
+                      elapsed=round(self.time_elapsed(), 1), timeout=self.timeout)
             
             try:
                 result = self.solve_single_quiz(current_url)
                 
                 if result.get('correct'):
-                    print(f"✓ Correct answer!")
+                    log_event("Correct answer", stage='result')
                     next_url = result.get('url')
                     if next_url:
-                        print(f"→ Moving to next quiz: {next_url}")
+                        log_event("Moving to next quiz", stage='result', url=next_url)
                         current_url = next_url
                     else:
-                        print("✓ Quiz chain completed!")
+                        log_event("Quiz chain completed", stage='result')
                         break
                 else:
-                    print(f"✗ Incorrect: {result.get('reason', 'Unknown error')}")
+                    log_event("Incorrect answer", stage='result', level='warning',
+                              reason=result.get('reason', 'Unknown error'))
                     next_url = result.get('url')
                     if next_url:
-                        print(f"→ Skipping to: {next_url}")
+                        log_event("Skipping to next quiz", stage='result', url=next_url)
                         current_url = next_url
                     else:
-                        print("Retrying same quiz...")
+                        log_event("Retrying same quiz", stage='result')
                         # Will retry in next iteration
                         time.sleep(2)
                         
             except Exception as e:
-                print(f"✗ Error solving quiz: {e}")
-                traceback.print_exc()
+                log_event(f"Error solving quiz: {e}", stage='chain', level='error', exc_info=True)
                 time.sleep(2)
                 
         if not self.within_time_limit():
-            print(f"\n⏰ Time limit exceeded!")
+            log_event("Time limit exceeded", stage='chain', level='warning')
         
-        print(f"\n{'='*60}")
-        print(f"Quiz chain ended. Total time: {self.time_elapsed():.1f}s")
-        print(f"{'='*60}\n")
+        log_event("Quiz chain ended", stage='chain', elapsed=round(self.time_elapsed(), 1))
     
     def solve_single_quiz(self, quiz_url):
         """Solve a single quiz task"""
         # Step 1: Fetch the quiz content
-        print("  Fetching quiz content...")
+        log_event("Fetching quiz content", stage='fetch', url=quiz_url)
         quiz_data = fetch_quiz_content(quiz_url)
         quiz_html = quiz_data['html']
         quiz_text = quiz_data['text']
+        captured = quiz_data.get('captured', {})
+        log_event("Fetched quiz content", stage='fetch', captured=len(captured),
+                  **quiz_data.get('network', {}))
         
         # Step 2: Parse and understand the task using LLM
-        print("  Analyzing task with LLM...")
+        log_event("Analyzing task with LLM", stage='analyze')
         task_analysis = self.analyze_task(quiz_html, quiz_text, quiz_url)
         
         # NEW: Resolve relative URLs to absolute using quiz_url as base
         if 'data_source' in task_analysis and task_analysis['data_source']:
             task_analysis['data_source'] = urljoin(quiz_url, task_analysis['data_source'])
-            print(f"  Resolved data_source: {task_analysis['data_source']}")
+            log_event("Resolved data_source", stage='analyze', data_source=task_analysis['data_source'])
         
         if 'submit_url' in task_analysis and task_analysis['submit_url']:
             task_analysis['submit_url'] = urljoin(quiz_url, task_analysis['submit_url'])
-            print(f"  Resolved submit_url: {task_analysis['submit_url']}")
+            log_event("Resolved submit_url", stage='analyze', submit_url=task_analysis['submit_url'])
         
         # Step 3: Execute the task
-        print("  Executing task...")
-        answer = self.execute_task(task_analysis)
+        log_event("Executing task", stage='execute')
+        answer = self.execute_task(task_analysis, captured=captured)
         
         # Step 4: Submit the answer (submit_url now guaranteed absolute)
-        print(f"  Submitting answer: {str(answer)[:100]}...")
+        log_event("Submitting answer", stage='submit', answer=str(answer)[:100])
         result = self.submit_answer(
             submit_url=task_analysis['submit_url'],  # Now absolute
             quiz_url=quiz_url,
@@ -143,16 +144,16 @@ Return ONLY valid JSON, no other text."""
             else:
                 raise ValueError("Could not parse task analysis")
         
-        print(f"  Task: {task_info.get('task_description', 'Unknown')}")
+        log_event("Task analysed", stage='analyze', task=task_info.get('task_description', 'Unknown'))
         return task_info
     
-    def execute_task(self, task_analysis):
+    def execute_task(self, task_analysis, captured=None):
         """Execute the task based on analysis (safe debug + validation)."""
         # ... (existing debug print unchanged)
         
         # Basic validation: ensure we have a dict-like object
         if not isinstance(task_analysis, dict):
-            print("ERROR: task_analysis is not a dict; aborting task execution.")
+            log_event("task_analysis is not a dict; aborting task execution", stage='execute', level='error')
             return {"error": "invalid_task_analysis", "detail": repr(task_analysis)}
 
         # NEW: Validate resolved URLs (post-resolution from solve_single_quiz)
@@ -168,19 +169,20 @@ Return ONLY valid JSON, no other text."""
         
         # Run the processor and catch exceptions so the thread doesn't die silently
         try:
-            answer = process_data_task(task_analysis)
+            answer = process_data_task(task_analysis, captured=captured)
             
             # NEW: Quick sanity check on answer
             if isinstance(answer, dict) and 'error' in answer:
-                print(f"WARNING: process_data_task returned error: {answer['error']}")
+                log_event("process_data_task returned error", stage='execute', level='warning',
+                          error=answer['error'])
                 # Optional: Retry once by re-calling with debug=True if your process_data_task supports it
                 # answer = process_data_task(task_analysis, debug=True)
                 return answer  # Still submit, but log for debugging
             
             return answer
         except Exception as e:
-            print("ERROR executing process_data_task:", type(e).__name__, e)
-            traceback.print_exc()  # Add for better local debugging
+            log_event(f"Error executing process_data_task: {type(e).__name__} {e}", stage='execute',
+                      level='error', exc_info=True)
             return {"error": "processing_failed", "exception": str(e)}
     
     def submit_answer(self, submit_url, quiz_url, answer):
@@ -198,11 +200,12 @@ Return ONLY valid JSON, no other text."""
             return response.json()
         except requests.exceptions.HTTPError as e:
             if response.status_code == 500:
-                print(f"  Server 500 on submit (bad answer? {str(answer)[:50]}...): {e}")
+                log_event(f"Server 500 on submit: {e}", stage='submit', level='warning',
+                          answer=str(answer)[:50])
                 return {'correct': False, 'reason': 'server_error_500', 'url': None}  # Treat as incorrect, no retry
             raise  # Re-raise other HTTP errors
         except Exception as e:
-            print(f"  Submit network error: {e}")
+            log_event(f"Submit network error: {e}", stage='submit', level='error')
             raise
     
     def within_time_limit(self):
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from utils import event_log
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    """Send events to a fresh JSONL file and reset the writer around each test"""
+    event_log.flush()
+    path = tmp_path / 'events.jsonl'
+    monkeypatch.setattr(event_log, 'EVENT_LOG_PATH', str(path))
+    monkeypatch.setattr(event_log, '_closed', False)
+    monkeypatch.setattr(event_log, '_rings', event_log.OrderedDict())
+    yield path
+    event_log.flush()
+    event_log.bind_job(None)
+
+
+def read_messages(path):
+    return [json.loads(line)['msg'] for line in path.read_text().splitlines()]
+
+
+def test_unserialisable_fields_do_not_kill_writer(log_file):
+    event_log.bind_job('job1')
+    event_log.log_event('bad', d={(1, 2): 3}, obj=object())
+    event_log.log_event('after')
+    event_log.flush()
+
+    assert read_messages(log_file) == ['bad', 'after']
+    events = event_log.get_job_events('job1')
+    assert [e['msg'] for e in events] == ['bad', 'after']
+    json.dumps(events)  # Ring contents must be JSON-safe for the /jobs/<id>/log endpoint
+
+
+def test_long_fields_are_truncated(log_file):
+    event_log.bind_job('job1')
+    event_log.log_event('long', response='x' * (event_log.MAX_FIELD_CHARS * 5))
+
+    event = event_log.get_job_events('job1')[0]
+    assert len(event['response']) == event_log.MAX_FIELD_CHARS
+
+
+def test_dead_writer_is_restarted(log_file):
+    event_log.log_event('first')
+    writer = event_log._writer
+    event_log._queue.put(event_log._STOP)
+    writer.join(2)
+    assert not writer.is_alive()
+
+    event_log.log_event('second')
+    assert event_log._writer is not writer and event_log._writer.is_alive()
+    event_log.flush()
+
+    assert read_messages(log_file) == ['first', 'second']
+
+
+def test_no_writer_started_after_flush(log_file):
+    event_log.log_event('before')
+    event_log.flush()
+    event_log.log_event('after')
+
+    assert event_log._writer is None
+    assert read_messages(log_file) == ['before']
+
+
+def test_unopenable_log_path_falls_back_to_stdout(log_file, monkeypatch, capsys):
+    monkeypatch.setattr(event_log, 'EVENT_LOG_PATH', str(log_file.parent / 'missing' / 'events.jsonl'))
+    event_log.log_event('to stdout')
+    event_log.flush()
+
+    assert 'to stdout' in capsys.readouterr().out
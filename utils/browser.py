@@ -1,15 +1,127 @@
 from playwright.sync_api import sync_playwright
+from urllib.parse import urlparse
 import time
 
-def fetch_quiz_content(url, wait_time=3):
+# Resource types aborted unless a domain policy says otherwise
+DEFAULT_BLOCKED_TYPES = {'image', 'media', 'font'}
+
+# Third-party analytics/ads hosts, always aborted unless a domain policy allows them
+ANALYTICS_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+    'googlesyndication.com', 'facebook.net', 'hotjar.com', 'segment.io',
+    'mixpanel.com', 'clarity.ms', 'plausible.io',
+)
+
+# Per-domain overrides, matched against the fetched page's host (and its subdomains)
+# and applied to every request that page makes
+# Example: {'example.com': {'block_types': {'image', 'stylesheet'}, 'allow_analytics': False}}
+DOMAIN_POLICIES = {}
+
+# Rough transfer sizes used to estimate bytes saved by aborted requests
+TYPICAL_SIZES = {
+    'image': 50_000, 'media': 500_000, 'font': 40_000,
+    'stylesheet': 20_000, 'script': 30_000,
+}
+
+CAPTURE_TYPES = {'xhr', 'fetch'}
+MAX_CAPTURE_BYTES = 2_000_000  # Skip capturing bodies larger than this
+MAX_CAPTURE_TOTAL = 8_000_000  # Stop capturing once this many bytes are held for a page
+MAX_CAPTURE_COUNT = 50  # ...or this many responses
+TEXT_CONTENT_TYPES = ('text/', 'json', 'csv', 'xml', 'javascript')  # Decoded to str; others kept as bytes
+
+def _host_matches(host, domain):
+    return host == domain or host.endswith('.' + domain)
+
+def _policy_for(host):
+    """Return (blocked resource types, allow analytics) for the page being fetched"""
+    for domain, policy in DOMAIN_POLICIES.items():
+        if _host_matches(host, domain):
+            return (set(policy.get('block_types', DEFAULT_BLOCKED_TYPES)),
+                    policy.get('allow_analytics', False))
+    return DEFAULT_BLOCKED_TYPES, False
+
+def _install_routing(page, stats, policy):
+    """Abort heavy/irrelevant requests made by the page according to its policy"""
+    blocked_types, allow_analytics = policy
+
+    def handle(route):
+        request = route.request
+        host = urlparse(request.url).hostname or ''
+        resource_type = request.resource_type
+
+        if not allow_analytics and any(_host_matches(host, d) for d in ANALYTICS_HOSTS):
+            reason = 'analytics'
+        elif resource_type in blocked_types:
+            reason = resource_type
+        else:
+            route.continue_()
+            return
+
+        stats['requests_blocked'] += 1
+        stats['blocked_by_type'][reason] = stats['blocked_by_type'].get(reason, 0) + 1
+        stats['bytes_saved_estimate'] += TYPICAL_SIZES.get(resource_type, 10_000)
+        route.abort()
+
+    page.route('**/*', handle)
+
+def _read_captured(responses):
+    """Read XHR/fetch response bodies collected during page load, within the capture budget"""
+    captured = {}
+    total = 0
+    for response in responses:
+        if len(captured) >= MAX_CAPTURE_COUNT or total >= MAX_CAPTURE_TOTAL:
+            break
+        headers = response.headers
+        try:
+            declared = int(headers.get('content-length', 0))
+        except ValueError:
+            declared = 0
+        if declared > MAX_CAPTURE_BYTES or total + declared > MAX_CAPTURE_TOTAL:
+            continue  # Don't pull an oversized body into memory
+        try:
+            body = response.body()
+        except Exception:
+            continue  # Body unavailable (redirect, aborted, page closed)
+        if len(body) > MAX_CAPTURE_BYTES or total + len(body) > MAX_CAPTURE_TOTAL:
+            continue  # Chunked/compressed responses may not declare their length
+        total += len(body)
+        content_type = headers.get('content-type', '')
+        if any(t in content_type.lower() for t in TEXT_CONTENT_TYPES):
+            body = body.decode('utf-8', errors='replace')
+        captured[response.url] = {
+            'status': response.status,
+            'content_type': content_type,
+            'body': body,
+        }
+    return captured
+
+def fetch_quiz_content(url, wait_time=3, block_resources=True, capture_responses=True):
     """
     Fetch rendered HTML content from a URL using headless browser
     This handles JavaScript-rendered content
+
+    Images, media, fonts and analytics are aborted (see DOMAIN_POLICIES), and
+    XHR/fetch response bodies are returned under 'captured' keyed by URL so
+    later stages can reuse them instead of downloading again (textual bodies
+    as str, binary ones as bytes).
     """
+    stats = {'requests_blocked': 0, 'blocked_by_type': {}, 'bytes_saved_estimate': 0}
+    data_responses = []
+
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
         page = browser.new_page()
         
+        if block_resources:
+            _install_routing(page, stats, _policy_for(urlparse(url).hostname or ''))
+        if capture_responses:
+            def on_response(response):
+                # Polling pages can fire many XHRs; only keep the first few for reading
+                if (len(data_responses) < MAX_CAPTURE_COUNT
+                        and response.request.resource_type in CAPTURE_TYPES and response.ok):
+                    data_responses.append(response)
+            page.on('response', on_response)
+        
         try:
             # Navigate to URL
             page.goto(url, wait_until='networkidle', timeout=30000)
@@ -23,12 +135,16 @@ def fetch_quiz_content(url, wait_time=3):
             # Also get visible text (useful for analysis)
             body_text = page.locator('body').inner_text()
             
+            captured = _read_captured(data_responses)
+            
             browser.close()
             
             return {
                 'html': content,
                 'text': body_text,
-                'url': url
+                'url': url,
+                'captured': captured,
+                'network': stats
             }
             
         except Exception as e:
@@ -1,23 +1,62 @@
 import requests
 import json  # For serialization
-import traceback  # For errors
 from urllib.parse import urlparse
 import os  # (optional)
 
 from utils.llm_helper import call_llm  # NEW: For processing content
 from utils.browser import fetch_quiz_content  # NEW: For webpages
+from utils.event_log import log_event
 
-def process_data_task(task_analysis, base_url=None):
+def summarize_csv(csv_text):
+    """Summarise CSV text to avoid huge dumps in the LLM prompt"""
+    import pandas as pd
+    from io import StringIO
+    df = pd.read_csv(StringIO(csv_text))
+    log_event("Loaded CSV", stage='download', rows=df.shape[0], columns=list(df.columns))
+    return {
+        'shape': list(df.shape),
+        'columns': list(df.columns),
+        'head': df.head(5).to_dict('records'),
+        'describe': df.describe().to_dict()
+    }
+
+def extract_pdf_text(pdf_bytes):
+    """Return the text of each page of a PDF"""
+    import fitz  # pymupdf
+    doc = fitz.open(stream=pdf_bytes, filetype='pdf')
+    pages = [page.get_text() for page in doc]
+    doc.close()
+    return pages
+
+def content_from_captured(cached, data_type):
+    """Build content from an XHR/fetch response captured by fetch_quiz_content"""
+    body = cached['body']
+    if isinstance(body, bytes) and data_type != 'csv':  # Binary response, handled like a downloaded file
+        if data_type == 'pdf' or 'pdf' in cached.get('content_type', ''):
+            return extract_pdf_text(body)
+        return body
+    if data_type == 'csv':
+        if isinstance(body, bytes):  # CSV served with a non-text content type
+            body = body.decode('utf-8', errors='replace')
+        return summarize_csv(body)
+    if data_type in ['json', 'api'] or 'json' in cached.get('content_type', ''):
+        try:
+            return json.loads(body)
+        except ValueError:
+            pass
+    return body
+
+def process_data_task(task_analysis, base_url=None, captured=None):
     data_source = task_analysis.get('data_source')
     data_type = task_analysis.get('data_type', 'webpage')
     submit_url = task_analysis.get('submit_url')
     
-    print(f"process_data_task: resolved data_source = {data_source}")
-    print(f"process_data_task: resolved submit_url = {submit_url}")
+    log_event("process_data_task: resolved sources", stage='process',
+              data_source=data_source, submit_url=submit_url)
     
     if not data_source and base_url:  # NEW: Fallback to base_url
         data_source = base_url
-        print(f"  Fallback data_source: {data_source}")
+        log_event("Fallback data_source", stage='process', data_source=data_source)
     
     if not data_source:
         return {'error': 'no_data_source'}
@@ -29,29 +68,21 @@ def process_data_task(task_analysis, base_url=None):
         is_file_download = any(ext in path for ext in ['.csv', '.pdf', '.json', '.xlsx', '.txt', '.mp3', '.wav'])
         
         content = None
-        if is_file_download or data_type in ['csv', 'pdf', 'json', 'image']:  # Exclude 'api' unless ext
-            print(f"  Downloading file ({data_type}) via requests...")
+        cached = captured.get(data_source) if captured else None
+        if cached is not None:  # Already loaded by the page, skip the second request
+            log_event("Reusing captured response", stage='download', data_type=data_type)
+            content = content_from_captured(cached, data_type)
+        
+        elif is_file_download or data_type in ['csv', 'pdf', 'json', 'image']:  # Exclude 'api' unless ext
+            log_event("Downloading file via requests", stage='download', data_type=data_type)
             response = requests.get(data_source, timeout=30, stream=True)
             response.raise_for_status()
             
             if data_type == 'csv':
-                import pandas as pd
-                from io import StringIO
-                csv_text = response.text
-                df = pd.read_csv(StringIO(csv_text))
-                content = {  # Summary to avoid huge dumps
-                    'shape': list(df.shape),
-                    'columns': list(df.columns),
-                    'head': df.head(5).to_dict('records'),
-                    'describe': df.describe().to_dict()
-                }
-                print(f"  Loaded CSV: {df.shape[0]} rows, columns: {list(df.columns)}")
+                content = summarize_csv(response.text)
             
             elif data_type == 'pdf':
-                import fitz  # pymupdf
-                doc = fitz.open(stream=response.content, filetype='pdf')
-                content = [page.get_text() for page in doc]
-                doc.close()
+                content = extract_pdf_text(response.content)
             
             elif data_type in ['json']:
                 content = response.json()
@@ -60,7 +91,7 @@ def process_data_task(task_analysis, base_url=None):
                 content = response.text if 'text/' in response.headers.get('Content-Type', '') else response.content
         
         else:  # Webpage/scrape/api: Use browser
-            print(f"  Fetching webpage via browser...")
+            log_event("Fetching webpage via browser", stage='download')
             quiz_data = fetch_quiz_content(data_source)
             content = quiz_data['text']  # Or 'html' if needed
         
@@ -84,12 +115,12 @@ Return just the final answer (e.g., number, string, JSON)."""
             else:
                 answer = call_llm(prompt, max_tokens=500)  # Uses default
             
-            print(f"  Processed answer preview: {str(answer)[:50]}...")
+            log_event("Processed answer", stage='process', preview=str(answer)[:50])
             return answer.strip() if isinstance(answer, str) else answer
         except Exception as llm_e:
-            print(f"  LLM error: {llm_e}")
+            log_event(f"LLM error: {llm_e}", stage='process', level='error')
             return {'error': 'llm_failed', 'exception': str(llm_e)[:200]}
         
     except Exception as e:
-        print(f"  Fetch/Process error: {e}")
+        log_event(f"Fetch/Process error: {e}", stage='process', level='error')
         return {'error': 'fetch_failed', 'exception': str(e)[:200]}
\ No newline at end of file
@@ -0,0 +1,202 @@
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+from queue import SimpleQueue, Empty
+
+# Where the background writer sends records: a JSONL file path, or stdout if unset
+EVENT_LOG_PATH = os.environ.get('EVENT_LOG_PATH')
+RING_SIZE = int(os.environ.get('EVENT_LOG_RING_SIZE', 200))  # Events kept per job
+MAX_JOBS = int(os.environ.get('EVENT_LOG_MAX_JOBS', 100))  # Jobs kept in memory
+MAX_PENDING = 10000  # Drop events instead of growing the queue without bound
+MAX_FIELD_CHARS = 2000  # Longer field values (tracebacks, response bodies) are truncated
+BATCH_SIZE = 256
+FLUSH_TIMEOUT = 2.0  # Seconds to wait for the writer at interpreter exit
+
+_queue = SimpleQueue()
+_context = threading.local()
+_rings = OrderedDict()
+_rings_lock = threading.Lock()
+_writer = None
+_writer_lock = threading.Lock()
+_closed = False  # Set by flush(); no new writer is started afterwards
+_dropped = 0
+_STOP = object()  # Sentinel telling the writer to drain, close its output and exit
+
+
+def register_job(job_id):
+    """Create the ring buffer that keeps job_id's recent events"""
+    if job_id is None:
+        return
+    with _rings_lock:
+        if job_id not in _rings:
+            _rings[job_id] = deque(maxlen=RING_SIZE)
+            while len(_rings) > MAX_JOBS:
+                _rings.popitem(last=False)
+
+
+def bind_job(job_id, step=None):
+    """
+    Tag every event logged from the current thread with job_id
+    Call once at the start of a job's worker thread
+    """
+    _context.job_id = job_id
+    _context.step = step
+    register_job(job_id)
+
+
+def set_step(step):
+    """Set the step (e.g. attempt number) attached to later events in this thread"""
+    _context.step = step
+
+
+def _json_safe(value):
+    """Return a bounded, JSON-serialisable copy of a field value"""
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value[:MAX_FIELD_CHARS]
+    try:
+        dumped = json.dumps(value, default=str)
+    except (TypeError, ValueError):
+        return repr(value)[:MAX_FIELD_CHARS]
+    if len(dumped) > MAX_FIELD_CHARS:
+        return dumped[:MAX_FIELD_CHARS]
+    return json.loads(dumped)
+
+
+def log_event(message, stage=None, level='info', exc_info=False, **fields):
+    """
+    Record a structured event; never blocks on I/O
+
+    The event is appended to its job's ring buffer straight away and queued
+    for the background writer.
+
+    Args:
+        message: Human-readable message
+        stage: Pipeline stage (fetch, analyze, execute, submit, llm, ...)
+        level: info, warning or error
+        exc_info: Attach the current exception's traceback
+        **fields: Extra data; non-JSON values are stringified, long ones truncated
+    """
+    global _dropped
+    job_id = getattr(_context, 'job_id', None)
+    record = {
+        'ts': round(time.time(), 3),
+        'job_id': job_id,
+        'step': getattr(_context, 'step', None),
+        'stage': stage,
+        'level': level,
+        'msg': _json_safe(message),
+    }
+    if exc_info:
+        fields['traceback'] = traceback.format_exc()[-MAX_FIELD_CHARS:]  # Keep the innermost frames
+    for key, value in fields.items():
+        record[key] = _json_safe(value)
+
+    if job_id is not None:
+        ring = _rings.get(job_id)
+        if ring is not None:
+            ring.append(record)
+
+    if _closed:
+        return
+    if _queue.qsize() >= MAX_PENDING:
+        _dropped += 1
+        return
+    _queue.put(record)
+    writer = _writer
+    if writer is None or not writer.is_alive():
+        _start_writer()
+
+
+def get_job_events(job_id):
+    """Return the most recent events for job_id, or None if the job is unknown"""
+    ring = _rings.get(job_id)
+    if ring is None:
+        return None
+    return list(ring)
+
+
+def flush(timeout=FLUSH_TIMEOUT):
+    """Write out all pending events and stop the writer (runs at exit)"""
+    global _writer, _closed
+    with _writer_lock:
+        _closed = True
+        writer, _writer = _writer, None
+        if writer is None or not writer.is_alive():
+            return
+        _queue.put(_STOP)
+    writer.join(timeout)
+
+
+atexit.register(flush)
+
+
+def _start_writer():
+    global _writer
+    with _writer_lock:
+        if _closed:
+            return
+        if _writer is None or not _writer.is_alive():
+            _writer = threading.Thread(target=_writer_loop, name='event-log-writer', daemon=True)
+            _writer.start()
+
+
+def _open_output():
+    if EVENT_LOG_PATH:
+        try:
+            return open(EVENT_LOG_PATH, 'a', encoding='utf-8')
+        except OSError as e:
+            sys.stdout.write(json.dumps({'ts': round(time.time(), 3), 'level': 'error',
+                                         'msg': f'cannot open event log, using stdout: {e}'}) + '\n')
+    return sys.stdout
+
+
+def _serialise(record):
+    try:
+        return json.dumps(record, default=str)
+    except Exception:
+        return json.dumps({'ts': round(time.time(), 3), 'level': 'error',
+                           'msg': 'unserialisable event', 'repr': repr(record)[:MAX_FIELD_CHARS]})
+
+
+def _writer_loop():
+    global _dropped
+    out = _open_output()
+    stopping = False
+    while not stopping:
+        # Block for the first record, then drain whatever else is pending
+        batch = []
+        item = _queue.get()
+        try:
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= BATCH_SIZE:
+                    break
+                item = _queue.get_nowait()
+        except Empty:
+            pass
+
+        lines = [_serialise(record) for record in batch]
+        if _dropped:
+            lines.append(json.dumps({'ts': round(time.time(), 3), 'level': 'warning',
+                                     'msg': 'event queue full, records dropped', 'dropped': _dropped}))
+            _dropped = 0
+
+        try:
+            if lines:
+                out.write('\n'.join(lines) + '\n')
+                out.flush()
+        except Exception:
+            pass  # Logging must never take the writer thread down
+
+    if out is not sys.stdout:
+        out.close()
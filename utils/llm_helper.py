@@ -1,5 +1,6 @@
 import requests
 from secret import AIPIPE_TOKEN
+from utils.event_log import log_event
 
 def call_llm(prompt, model="openai/gpt-4o", temperature=0.0, max_tokens=2000):
     """
@@ -41,9 +42,8 @@ def call_llm(prompt, model="openai/gpt-4o", temperature=0.0, max_tokens=2000):
         return data['choices'][0]['message']['content']
         
     except Exception as e:
-        print(f"LLM API Error: {e}")
-        if hasattr(e, 'response') and e.response:
-            print(f"Response: {e.response.text}")
+        log_event(f"LLM API Error: {e}", stage='llm', level='error',
+                  response=e.response.text[:500] if getattr(e, 'response', None) is not None else None)
         raise
 
 def call_vision_llm(prompt, image_base64, model="openai/gpt-4o"):
@@ -94,7 +94,6 @@ def call_vision_llm(prompt, image_base64, model="openai/gpt-4o"):
         return data['choices'][0]['message']['content']
         
     except Exception as e:
-        print(f"Vision LLM API Error: {e}")
-        if hasattr(e, 'response') and e.response:
-            print(f"Response: {e.response.text}")
+        log_event(f"Vision LLM API Error: {e}", stage='llm', level='error',
+                  response=e.response.text[:500] if getattr(e, 'response', None) is not None else None)
         raise
\ No newline at end of file